@@ -1,8 +1,137 @@
 # This file is auto-generated during build. Do not edit manually.
+import _thread
+import functools
+
 VERSION = "0.1.0"
 GIT_SHA = "unknown"
 REPO_URL = "https://github.com/davidfowl/tally"
 
+# How long a successful update check is reused before hitting GitHub again
+UPDATE_CHECK_TTL = 24 * 60 * 60
+
+
+def _get_update_cache_path():
+    """Get the path of the on-disk update check cache.
+
+    Uses %LOCALAPPDATA%\\tally on Windows, $XDG_CACHE_HOME/tally (default
+    ~/.cache/tally) elsewhere. Returns None if no cache location is available.
+    """
+    import os
+    import sys
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', '')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    if not base:
+        return None
+    return os.path.join(base, 'tally', 'update-check.json')
+
+
+def _read_update_cache(ttl: float = UPDATE_CHECK_TTL) -> dict | None:
+    """Return the cached update check result if it is still fresh, else None."""
+    import os
+    import time
+    import json
+
+    cache_path = _get_update_cache_path()
+    if not cache_path:
+        return None
+    try:
+        # A future mtime (clock skew, restored backup) counts as stale
+        if not 0 <= time.time() - os.path.getmtime(cache_path) <= ttl:
+            return None
+        with open(cache_path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Ignore results recorded by a different tally version
+    if not isinstance(data, dict) or data.get('current_version') != VERSION:
+        return None
+    data.pop('timestamp', None)
+    return data
+
+
+def _write_update_cache(result: dict) -> None:
+    """Atomically write an update check result to the on-disk cache."""
+    import os
+    import time
+    import json
+
+    cache_path = _get_update_cache_path()
+    if not cache_path:
+        return
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({**result, 'timestamp': time.time()}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+GITHUB_API_HOST = 'api.github.com'
+
+# Keep-alive connection to the GitHub API, reused by _github_get()
+_conn = None
+# _thread is always loaded, so this costs nothing at import (unlike threading)
+_conn_lock = _thread.allocate_lock()
+
+
+def _github_get(path: str, timeout: float):
+    """GET a GitHub API path and return the decoded JSON body.
+
+    Reuses one keep-alive HTTPS connection across calls so later requests skip
+    the TCP/TLS handshake. If an HTTPS proxy is configured, goes through
+    urllib instead so proxy settings are honored.
+
+    Not used yet: each command makes at most one API request today, so this
+    only pays off once a command needs several endpoints. Unlike urlopen it
+    does not follow redirects; 3xx responses raise like any other non-200.
+
+    Raises on network errors and non-200 responses.
+    """
+    global _conn
+    import json
+    import urllib.request
+
+    headers = {
+        'Accept': 'application/vnd.github.v3+json',
+        'User-Agent': f'tally/{VERSION}'
+    }
+
+    if urllib.request.getproxies().get('https'):
+        req = urllib.request.Request(f'https://{GITHUB_API_HOST}{path}', headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.load(response)
+
+    import http.client
+
+    with _conn_lock:
+        if _conn is None:
+            _conn = http.client.HTTPSConnection(GITHUB_API_HOST, timeout=timeout)
+        conn = _conn
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise http.client.HTTPException(f"HTTP {response.status} for {path}")
+        except (http.client.HTTPException, OSError):
+            # Drop the connection so the next call reconnects
+            conn.close()
+            _conn = None
+            raise
+    return json.loads(body)
+
 
 def check_for_updates(timeout: float = 2.0) -> dict | None:
     """Check GitHub for a newer version.
@@ -12,14 +141,21 @@ def check_for_updates(timeout: float = 2.0) -> dict | None:
 
     If running a dev version (e.g., 0.1.156-dev), checks for newer dev builds.
     Otherwise checks for newer stable releases.
-    """
-    import urllib.request
-    import json
 
+    Successful results are cached on disk for UPDATE_CHECK_TTL seconds.
+    """
     # Don't check if we're running an unknown version
     if VERSION in ("unknown", "dev", "0.1.0"):
         return None
 
+    cached = _read_update_cache()
+    if cached is not None:
+        return cached
+
+    # Only pay for the HTTP client on a cache miss
+    import urllib.request
+    import json
+
     # Detect if we're on a prerelease version
     is_prerelease = "-dev" in VERSION
 
@@ -46,7 +182,7 @@ def check_for_updates(timeout: float = 2.0) -> dict | None:
         )
 
         with urllib.request.urlopen(req, timeout=timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+            data = json.load(response)
             latest_tag = data.get('tag_name', '')
 
             # Remove 'v' prefix if present
@@ -55,7 +191,7 @@ def check_for_updates(timeout: float = 2.0) -> dict | None:
             # Compare versions
             update_available = _version_greater(latest_version, VERSION)
 
-            return {
+            result = {
                 'latest_version': latest_version,
                 'current_version': VERSION,
                 'update_available': update_available,
@@ -66,22 +202,34 @@ def check_for_updates(timeout: float = 2.0) -> dict | None:
         # Network error, timeout, or API error - fail silently
         return None
 
+    _write_update_cache(result)
+    return result
+
+
+@functools.lru_cache(maxsize=128)
+def parse_version(v: str) -> tuple:
+    """Parse a version string into a comparable tuple.
+
+    Raises ValueError or IndexError for malformed versions (not cached).
+    """
+    # Split off prerelease suffix (e.g., "0.1.100-dev" -> "0.1.100", "dev")
+    base, _, prerelease = v.partition('-')
+    parts = base.split('.')
+    nums = tuple(int(p) for p in parts[:3])
+    # Prerelease versions sort before release (0 = prerelease, 1 = release)
+    return nums + (0 if prerelease else 1,)
+
 
 def _version_greater(v1: str, v2: str) -> bool:
     """Return True if v1 > v2 using semantic versioning comparison.
 
     Handles -dev suffix: 0.1.100-dev < 0.1.100 (prerelease < release)
     """
+    # Common case: already on the latest version
+    if v1 == v2:
+        return False
     try:
-        def parse_version(v: str) -> tuple:
-            # Split off prerelease suffix (e.g., "0.1.100-dev" -> "0.1.100", "dev")
-            base, _, prerelease = v.partition('-')
-            parts = base.split('.')
-            nums = tuple(int(p) for p in parts[:3])
-            # Prerelease versions sort before release (0 = prerelease, 1 = release)
-            return nums + (0 if prerelease else 1,)
-
-        return parse_version(v1) > parse_version(v2)
+        return parse_version(str(v1)) > parse_version(str(v2))
     except (ValueError, IndexError):
         return False
 
@@ -140,7 +288,7 @@ def get_latest_release_info(timeout: float = 10.0, prerelease: bool = False) ->
         )
 
         with urllib.request.urlopen(req, timeout=timeout) as response:
-            data = json.loads(response.read().decode('utf-8'))
+            data = json.load(response)
 
             # For prerelease, find the one marked as prerelease
             if prerelease:
@@ -17,6 +17,14 @@ from ._version import (
 )
 
 
+def _available_update():
+    """Return update info if a newer version is available, else None."""
+    update_info = check_for_updates()
+    if update_info and update_info.get('update_available'):
+        return update_info
+    return None
+
+
 def main():
     """Main entry point for tally CLI."""
     parser = argparse.ArgumentParser(
@@ -403,8 +411,8 @@ def main():
         parser.print_help()
 
         # Check for updates
-        update_info = check_for_updates()
-        if update_info and update_info.get('update_available'):
+        update_info = _available_update()
+        if update_info:
             print()
             if update_info.get('is_prerelease'):
                 print(f"Dev build available: v{update_info['latest_version']} (current: v{update_info['current_version']})")
@@ -452,8 +460,8 @@ def main():
         print(REPO_URL)
 
         # Check for updates
-        update_info = check_for_updates()
-        if update_info and update_info.get('update_available'):
+        update_info = _available_update()
+        if update_info:
             print()
             if update_info.get('is_prerelease'):
                 print(f"Dev build available: v{update_info['latest_version']}")
@@ -2,35 +2,67 @@
 Terminal color utilities for tally CLI.
 """
 
+import codecs
+import functools
 import os
 import sys
 
 
+_ANSI_ON = {
+    'RESET': '\033[0m',
+    'BOLD': '\033[1m',
+    'DIM': '\033[2m',
+    'GREEN': '\033[32m',
+    'CYAN': '\033[36m',
+    'BLUE': '\033[34m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'UNDERLINE': '\033[4m',
+}
+_ANSI_OFF = {name: '' for name in _ANSI_ON}
+
+
+@functools.lru_cache(maxsize=1)
 def supports_color():
-    """Check if the terminal supports color output."""
-    if not sys.stdout.isatty():
+    """Check if the terminal supports color output (cached per process)."""
+    # Snapshot the tty state and environment once; call refresh_color_support()
+    # to re-evaluate after changing them.
+    is_tty, no_color, force_color, term = (
+        sys.stdout.isatty(),
+        os.environ.get('NO_COLOR'),
+        os.environ.get('FORCE_COLOR'),
+        os.environ.get('TERM', ''),
+    )
+    if not is_tty:
         return False
-    if os.environ.get('NO_COLOR'):
+    if no_color:
         return False
-    if os.environ.get('FORCE_COLOR'):
+    if force_color:
         return True
     # Check for common terminal types
-    term = os.environ.get('TERM', '')
     return term != 'dumb'
 
 
+def refresh_color_support():
+    """Clear the cached supports_color() result (e.g. after patching env in tests)."""
+    supports_color.cache_clear()
+
+
 def setup_windows_encoding():
     """Set UTF-8 encoding on Windows to support Unicode output."""
     if sys.platform != 'win32':
         return
 
-    import codecs
-
     for stream_name in ('stdout', 'stderr'):
         stream = getattr(sys, stream_name)
-        # Skip if already UTF-8
-        if getattr(stream, 'encoding', '').lower().replace('-', '') == 'utf8':
-            continue
+        # Skip if already UTF-8 (codecs.lookup normalizes aliases like 'UTF8')
+        encoding = getattr(stream, 'encoding', None)
+        if encoding:
+            try:
+                if codecs.lookup(encoding).name == 'utf-8':
+                    continue
+            except LookupError:
+                pass
         try:
             # Method 1: reconfigure (works in normal Python 3.7+)
             stream.reconfigure(encoding='utf-8', errors='replace')
@@ -50,29 +82,18 @@ setup_windows_encoding()
 
 
 class Colors:
-    """ANSI color codes with automatic detection."""
-    def __init__(self):
-        if supports_color():
-            self.RESET = '\033[0m'
-            self.BOLD = '\033[1m'
-            self.DIM = '\033[2m'
-            self.GREEN = '\033[32m'
-            self.CYAN = '\033[36m'
-            self.BLUE = '\033[34m'
-            self.YELLOW = '\033[33m'
-            self.RED = '\033[31m'
-            self.UNDERLINE = '\033[4m'
-        else:
-            self.RESET = ''
-            self.BOLD = ''
-            self.DIM = ''
-            self.GREEN = ''
-            self.CYAN = ''
-            self.BLUE = ''
-            self.YELLOW = ''
-            self.RED = ''
-            self.UNDERLINE = ''
+    """ANSI color codes (empty strings when color is disabled)."""
+    __slots__ = tuple(_ANSI_ON)
+
+    def __init__(self, **codes):
+        for name in self.__slots__:
+            setattr(self, name, codes.get(name, ''))
+
+
+def _make_colors():
+    """Build the Colors instance for the current terminal."""
+    return Colors(**(_ANSI_ON if supports_color() else _ANSI_OFF))
 
 
 # Singleton instance
-C = Colors()
+C = _make_colors()
@@ -146,8 +146,6 @@ def get_all_rules(rules_path=None, match_mode='first_match'):
         When loading .rules files, the MerchantEngine is cached so that
         normalize_merchant() can use the full engine features (let:, field:).
     """
-    global _cached_engine, _cached_engine_path
-
     user_rules_with_source = []
     if rules_path:
         # Check if it's the new .rules format
@@ -156,29 +154,7 @@ def get_all_rules(rules_path=None, match_mode='first_match'):
                 from .merchant_engine import load_merchants_file
                 from pathlib import Path
                 engine = load_merchants_file(Path(rules_path), match_mode=match_mode)
-
-                # Cache the engine for use by normalize_merchant()
-                _cached_engine = engine
-                _cached_engine_path = rules_path
-
-                # Convert MerchantRule objects to the tuple format used by parsing code
-                # Only include categorization rules (skip tag-only rules)
-                for rule in engine.rules:  # Include ALL rules (categorization + tag-only)
-                    # Preserve the full match_expr for expression-based rules
-                    # This allows amount/date conditions like "regex(...) and amount == 1500" to work
-                    pattern = rule.match_expr
-                    regex_pattern = _expr_to_regex(rule.match_expr)
-                    parsed = ParsedPattern(regex_pattern=regex_pattern)
-                    user_rules_with_source.append((
-                        pattern,          # Full expression (for expr matching)
-                        rule.name,        # merchant name
-                        rule.category,    # Empty for tag-only rules
-                        rule.subcategory, # Empty for tag-only rules
-                        parsed,
-                        'user',
-                        list(rule.tags)
-                    ))
-                return user_rules_with_source
+                return cache_engine_rules(engine, rules_path)
             except Exception:
                 pass  # Fall through to CSV handling if .rules parsing fails
 
@@ -202,6 +178,42 @@ def get_all_rules(rules_path=None, match_mode='first_match'):
     return user_rules_with_source
 
 
+def cache_engine_rules(engine: "MerchantEngine", rules_path: str) -> list:
+    """Cache a loaded MerchantEngine and return its rules as tuples.
+
+    The engine is cached for use by normalize_merchant(), so callers that
+    already have an engine for rules_path get the same result as
+    get_all_rules(rules_path) without re-reading the file.
+
+    Returns:
+        List of (pattern, merchant, category, subcategory, parsed_pattern, 'user', tags) tuples.
+    """
+    global _cached_engine, _cached_engine_path
+
+    # Cache the engine for use by normalize_merchant()
+    _cached_engine = engine
+    _cached_engine_path = rules_path
+
+    # Convert MerchantRule objects to the tuple format used by parsing code
+    user_rules_with_source = []
+    for rule in engine.rules:  # Include ALL rules (categorization + tag-only)
+        # Preserve the full match_expr for expression-based rules
+        # This allows amount/date conditions like "regex(...) and amount == 1500" to work
+        pattern = rule.match_expr
+        regex_pattern = _expr_to_regex(rule.match_expr)
+        parsed = ParsedPattern(regex_pattern=regex_pattern)
+        user_rules_with_source.append((
+            pattern,          # Full expression (for expr matching)
+            rule.name,        # merchant name
+            rule.category,    # Empty for tag-only rules
+            rule.subcategory, # Empty for tag-only rules
+            parsed,
+            'user',
+            list(rule.tags)
+        ))
+    return user_rules_with_source
+
+
 def get_tag_only_rules(rules_path, match_mode='first_match'):
     """Get tag-only rules from a .rules file.
 
@@ -7,32 +7,74 @@ Handles:
 - CSV to .rules format migration
 """
 
+import functools
 import os
 import shutil
 import sys
 
 from .colors import C
-from .merchant_utils import get_all_rules, load_merchant_rules
+from .merchant_utils import cache_engine_rules, get_all_rules, load_merchant_rules
 
 
 # Schema version for asset migrations
 SCHEMA_VERSION = 1
 
 
+def _rebuild_banner():
+    """Render the CSV deprecation banner with the current terminal colors."""
+    global _CSV_BANNER
+    _CSV_BANNER = "\n".join([
+        "",
+        f"{C.YELLOW}╭─ Upgrade Available ─────────────────────────────────────────────────╮{C.RESET}",
+        f"{C.YELLOW}│{C.RESET} Found: merchant_categories.csv (legacy CSV format)                  {C.YELLOW}│{C.RESET}",
+        f"{C.YELLOW}│{C.RESET}                                                                      {C.YELLOW}│{C.RESET}",
+        f"{C.YELLOW}│{C.RESET} The new .rules format supports powerful expressions:                 {C.YELLOW}│{C.RESET}",
+        f"{C.YELLOW}│{C.RESET}   match: contains(\"COSTCO\") and amount > 200                        {C.YELLOW}│{C.RESET}",
+        f"{C.YELLOW}│{C.RESET}   match: regex(\"UBER.*EATS\") and month == 12                        {C.YELLOW}│{C.RESET}",
+        f"{C.YELLOW}╰──────────────────────────────────────────────────────────────────────╯{C.RESET}",
+        "",
+        "",
+    ])
+    return _CSV_BANNER
+
+
+# Rendered once at import; colors don't change after startup
+_CSV_BANNER = _rebuild_banner()
+
+_NO_RULES_WARNING = (
+    "\n"
+    "⚠️  No merchant rules defined - all transactions will be 'Unknown'\n"
+    "    Run 'tally discover' to find unknown merchants and get suggested rules.\n"
+    "    Tip: Use an AI agent with 'tally discover' to auto-generate rules!\n"
+    "\n"
+)
+
+# Config directories already confirmed up to date in this process
+_migrations_done: set[str] = set()
+
+
+def _reset_migration_cache():
+    """Forget cached schema versions (for testing)."""
+    get_schema_version.cache_clear()
+    _migrations_done.clear()
+
+
+@functools.lru_cache(maxsize=16)
 def get_schema_version(config_dir):
     """Get current schema version from config directory.
 
+    The result is cached per config_dir for the life of the process.
+
     Returns:
         int: Schema version (0 if no marker file exists - legacy layout)
     """
     schema_file = os.path.join(config_dir, '.tally-schema')
-    if os.path.exists(schema_file):
-        try:
-            with open(schema_file, encoding='utf-8') as f:
-                return int(f.read().strip())
-        except (ValueError, IOError):
-            return 0
-    return 0
+    try:
+        # The marker is a bare ASCII integer, so skip the text decoder
+        with open(schema_file, 'rb') as f:
+            return int(f.read().strip() or b'0')
+    except (ValueError, OSError):
+        return 0
 
 
 def run_migrations(config_dir, skip_confirm=False):
@@ -45,9 +87,13 @@ def run_migrations(config_dir, skip_confirm=False):
     Returns:
         str: Path to config directory (may change if layout migrated)
     """
+    if config_dir in _migrations_done:
+        return config_dir
+
     current = get_schema_version(config_dir)
 
     if current >= SCHEMA_VERSION:
+        _migrations_done.add(config_dir)
         return config_dir  # Already up to date
 
     # Run migrations in order
@@ -72,7 +118,8 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
     # Only migrate if we're in the old layout (./config at working directory root)
     if os.path.basename(old_config_dir) != 'config':
         return None
-    if os.path.dirname(old_config_dir) != os.getcwd():
+    cwd = os.getcwd()
+    if os.path.dirname(old_config_dir) != cwd:
         return None
 
     # Prompt user (skip if non-interactive or --yes flag)
@@ -81,11 +128,13 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         if not sys.stdin.isatty():
             return None
 
-        print()
-        print("Migration available: Layout update")
-        print("  Current: ./config (legacy layout)")
-        print("  New: ./tally/config")
-        print()
+        # Keep the notice out of input(): without readline, CPython writes the
+        # prompt to stderr on a tty, and the notice belongs on stdout
+        sys.stdout.write(
+            "\nMigration available: Layout update\n"
+            "  Current: ./config (legacy layout)\n"
+            "  New: ./tally/config\n\n"
+        )
         try:
             response = input("Migrate to new layout? [Y/n]: ").strip().lower()
         except (EOFError, KeyboardInterrupt):
@@ -95,7 +144,7 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
             return None
 
     # Perform migration
-    tally_dir = os.path.abspath('tally')
+    tally_dir = os.path.join(cwd, 'tally')
     try:
         os.makedirs(tally_dir, exist_ok=True)
 
@@ -105,17 +154,22 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         shutil.move(old_config_dir, new_config)
 
         # Move data and output directories if they exist
-        for subdir in ['data', 'output']:
-            old_path = os.path.abspath(subdir)
-            if os.path.isdir(old_path):
-                new_path = os.path.join(tally_dir, subdir)
+        wanted = ('data', 'output')
+        with os.scandir(cwd) as it:
+            found = {entry.name for entry in it if entry.name in wanted and entry.is_dir()}
+        for subdir in wanted:
+            old_path = os.path.join(cwd, subdir)
+            # On case-insensitive filesystems (macOS, Windows) the scan misses
+            # e.g. Data/, which isdir() still resolves
+            if subdir in found or os.path.isdir(old_path):
                 print(f"  Moving {subdir}/ -> tally/{subdir}/")
-                shutil.move(old_path, new_path)
+                shutil.move(old_path, os.path.join(tally_dir, subdir))
 
         # Write schema version marker
         schema_file = os.path.join(new_config, '.tally-schema')
-        with open(schema_file, 'w', encoding='utf-8') as f:
-            f.write('1\n')
+        with open(schema_file, 'wb') as f:
+            f.write(b'1\n')
+        _migrations_done.add(new_config)
 
         print("✓ Migrated to ./tally/")
         return new_config
@@ -125,7 +179,9 @@ def migrate_v0_to_v1(old_config_dir, skip_confirm=False):
         return None
 
 
-def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) -> bool:
+def migrate_csv_to_rules(
+    csv_file: str, config_dir: str, backup: bool = True, match_mode: str = 'first_match'
+) -> tuple[bool, list | None]:
     """
     Migrate merchant_categories.csv to merchants.rules format.
 
@@ -133,16 +189,22 @@ def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) ->
         csv_file: Path to the CSV file
         config_dir: Path to config directory
         backup: Whether to rename old CSV to .bak
+        match_mode: 'first_match' (default) or 'most_specific'
 
     Returns:
-        True if migration was successful
+        Tuple of (success, rules). On success, rules is what
+        get_all_rules(merchants.rules, match_mode) would return, and the
+        engine is cached the same way, without re-reading the new file.
+        rules is None if migration failed.
     """
-    from .merchant_engine import csv_to_merchants_content
+    from .merchant_engine import csv_to_merchants_content, parse_merchants
 
     try:
         # Load and convert
         csv_rules = load_merchant_rules(csv_file)
         content = csv_to_merchants_content(csv_rules)
+        # Parse before touching disk so a bad conversion leaves the CSV in place
+        engine = parse_merchants(content, match_mode=match_mode)
 
         # Write new file
         new_file = os.path.join(config_dir, 'merchants.rules')
@@ -152,26 +214,104 @@ def migrate_csv_to_rules(csv_file: str, config_dir: str, backup: bool = True) ->
         print(f"      Converted {len(csv_rules)} merchant rules to new format")
 
         # Backup old file
-        if backup and os.path.exists(csv_file):
-            shutil.move(csv_file, csv_file + '.bak')
-            print(f"  {C.GREEN}✓{C.RESET} Backed up: merchant_categories.csv → .bak")
+        if backup:
+            try:
+                shutil.move(csv_file, csv_file + '.bak')
+                print(f"  {C.GREEN}✓{C.RESET} Backed up: merchant_categories.csv → .bak")
+            except FileNotFoundError:
+                pass
 
         # Update settings.yaml to reference new file
         settings_path = os.path.join(config_dir, 'settings.yaml')
-        if os.path.exists(settings_path):
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            if 'merchants_file:' not in content:
-                with open(settings_path, 'a', encoding='utf-8') as f:
-                    f.write('\n# Merchant rules file (migrated from CSV)\n')
-                    f.write('merchants_file: config/merchants.rules\n')
-                print(f"  {C.GREEN}✓{C.RESET} Updated: config/settings.yaml")
-                print(f"      Added merchants_file: config/merchants.rules")
-
-        return True
+        try:
+            # Byte scan: the key is ASCII, so there's no need to decode the file
+            with open(settings_path, 'rb') as f:
+                updated = b'merchants_file:' not in f.read()
+        except FileNotFoundError:
+            updated = False
+        if updated:
+            # Only require write access when there is something to add
+            with open(settings_path, 'ab') as f:
+                f.write(b'\n# Merchant rules file (migrated from CSV)\n'
+                        b'merchants_file: config/merchants.rules\n')
+            print(f"  {C.GREEN}✓{C.RESET} Updated: config/settings.yaml")
+            print(f"      Added merchants_file: config/merchants.rules")
+
+        return True, cache_engine_rules(engine, new_file)
     except Exception as e:
         print(f"  {C.RED}✗{C.RESET} Migration failed: {e}")
-        return False
+        return False, None
+
+
+def _print_rules_loaded(rules: list, merchants_file: str) -> None:
+    """Report how many rules were loaded, warning if there are none."""
+    print(f"Loaded {len(rules)} categorization rules from {merchants_file}")
+    if len(rules) == 0:
+        sys.stdout.write(_NO_RULES_WARNING)
+
+
+def _load_csv_rules(merchants_file, config_dir, rule_mode, quiet, migrate):
+    """Load legacy CSV rules, offering migration to the .rules format."""
+    csv_rules = load_merchant_rules(merchants_file)
+
+    # Determine if we should migrate
+    should_migrate = migrate  # --migrate flag forces it
+    is_interactive = sys.stdout.isatty() and not migrate
+
+    if not quiet:
+        sys.stdout.write(_CSV_BANNER)
+
+    if is_interactive:
+        # Only prompt if interactive and not using --migrate
+        try:
+            # Banner was written to stdout above; input() only gets the question
+            response = input("   Migrate to new format? [y/N] ").strip().lower()
+            should_migrate = (response == 'y')
+        except (EOFError, KeyboardInterrupt):
+            should_migrate = False
+
+        if not should_migrate:
+            sys.stdout.write(f"   {C.DIM}Skipped - continuing with CSV format for this run{C.RESET}\n\n")
+    elif not migrate and not quiet:
+        # Non-interactive without --migrate flag
+        sys.stdout.write(f"   {C.DIM}Tip: Run with --migrate to convert automatically{C.RESET}\n\n")
+
+    if should_migrate:
+        # Perform migration using shared helper
+        sys.stdout.write(f"{C.CYAN}Migrating to new format...{C.RESET}\n\n")
+        success, rules = migrate_csv_to_rules(merchants_file, config_dir, backup=True, match_mode=rule_mode)
+        if success:
+            sys.stdout.write(f"\n{C.GREEN}Migration complete!{C.RESET} Your rules now support expressions.\n\n")
+            # Rules from the migrated file, parsed from memory rather than re-read
+            return rules
+
+    # Continue with CSV format for this run (backwards compatible)
+    if not quiet:
+        _print_rules_loaded(csv_rules, merchants_file)
+
+    return get_all_rules(merchants_file, match_mode=rule_mode)
+
+
+def _load_new_rules(merchants_file, config_dir, rule_mode, quiet, migrate):
+    """Load rules from a .rules file."""
+    rules = get_all_rules(merchants_file, match_mode=rule_mode)
+    if not quiet:
+        _print_rules_loaded(rules, merchants_file)
+    return rules
+
+
+def _load_no_rules(merchants_file, config_dir, rule_mode, quiet, migrate):
+    """Fall back to built-in rules when no merchant rules file exists."""
+    if not quiet:
+        print(f"No merchant rules found - transactions will be categorized as Unknown")
+    return get_all_rules(match_mode=rule_mode)
+
+
+# Rule loaders keyed by config['_merchants_format']
+_MERCHANT_LOADERS = {
+    'csv': _load_csv_rules,
+    'new': _load_new_rules,
+}
 
 
 def check_merchant_migration(config: dict, config_dir: str, quiet: bool = False, migrate: bool = False) -> list:
@@ -188,88 +328,10 @@ def check_merchant_migration(config: dict, config_dir: str, quiet: bool = False,
         List of merchant rules (in the format expected by existing code)
     """
     merchants_file = config.get('_merchants_file')
-    merchants_format = config.get('_merchants_format')
     rule_mode = config.get('rule_mode', 'first_match')
 
-    if not merchants_file:
-        # No rules file found
-        if not quiet:
-            print(f"No merchant rules found - transactions will be categorized as Unknown")
-        return get_all_rules(match_mode=rule_mode)
-
-    if merchants_format == 'csv':
-        # CSV format - show deprecation warning and offer migration
-        csv_rules = load_merchant_rules(merchants_file)
-
-        # Determine if we should migrate
-        should_migrate = migrate  # --migrate flag forces it
-        is_interactive = sys.stdout.isatty() and not migrate
-
-        if not quiet:
-            print()
-            print(f"{C.YELLOW}╭─ Upgrade Available ─────────────────────────────────────────────────╮{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET} Found: merchant_categories.csv (legacy CSV format)                  {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}                                                                      {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET} The new .rules format supports powerful expressions:                 {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}   match: contains(\"COSTCO\") and amount > 200                        {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}│{C.RESET}   match: regex(\"UBER.*EATS\") and month == 12                        {C.YELLOW}│{C.RESET}")
-            print(f"{C.YELLOW}╰──────────────────────────────────────────────────────────────────────╯{C.RESET}")
-            print()
-
-        if is_interactive:
-            # Only prompt if interactive and not using --migrate
-            try:
-                response = input(f"   Migrate to new format? [y/N] ").strip().lower()
-                should_migrate = (response == 'y')
-            except (EOFError, KeyboardInterrupt):
-                should_migrate = False
-
-            if not should_migrate:
-                print(f"   {C.DIM}Skipped - continuing with CSV format for this run{C.RESET}")
-                print()
-        elif not migrate and not quiet:
-            # Non-interactive without --migrate flag
-            print(f"   {C.DIM}Tip: Run with --migrate to convert automatically{C.RESET}")
-            print()
-
-        if should_migrate:
-            # Perform migration using shared helper
-            print(f"{C.CYAN}Migrating to new format...{C.RESET}")
-            print()
-            if migrate_csv_to_rules(merchants_file, config_dir, backup=True):
-                print()
-                print(f"{C.GREEN}Migration complete!{C.RESET} Your rules now support expressions.")
-                print()
-                # Return new rules from migrated file
-                new_file = os.path.join(config_dir, 'merchants.rules')
-                return get_all_rules(new_file, match_mode=rule_mode)
-
-        # Continue with CSV format for this run (backwards compatible)
-        if not quiet:
-            print(f"Loaded {len(csv_rules)} categorization rules from {merchants_file}")
-            if len(csv_rules) == 0:
-                print()
-                print("⚠️  No merchant rules defined - all transactions will be 'Unknown'")
-                print("    Run 'tally discover' to find unknown merchants and get suggested rules.")
-                print("    Tip: Use an AI agent with 'tally discover' to auto-generate rules!")
-                print()
-
-        return get_all_rules(merchants_file, match_mode=rule_mode)
-
-    # New .rules format
-    if merchants_format == 'new':
-        rules = get_all_rules(merchants_file, match_mode=rule_mode)
-        if not quiet:
-            print(f"Loaded {len(rules)} categorization rules from {merchants_file}")
-            if len(rules) == 0:
-                print()
-                print("⚠️  No merchant rules defined - all transactions will be 'Unknown'")
-                print("    Run 'tally discover' to find unknown merchants and get suggested rules.")
-                print("    Tip: Use an AI agent with 'tally discover' to auto-generate rules!")
-                print()
-        return rules
-
-    # No rules file found
-    if not quiet:
-        print(f"No merchant rules found - transactions will be categorized as Unknown")
-    return get_all_rules(match_mode=rule_mode)
+    if merchants_file:
+        loader = _MERCHANT_LOADERS.get(config.get('_merchants_format'), _load_no_rules)
+    else:
+        loader = _load_no_rules
+    return loader(merchants_file, config_dir, rule_mode, quiet, migrate)
@@ -0,0 +1,63 @@
+"""Tests for terminal color detection."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tally import colors
+
+
+class _TTY:
+    def isatty(self):
+        return True
+
+
+@pytest.fixture
+def tty(monkeypatch):
+    monkeypatch.setattr(colors, 'sys', SimpleNamespace(stdout=_TTY()))
+    monkeypatch.delenv('NO_COLOR', raising=False)
+    monkeypatch.delenv('FORCE_COLOR', raising=False)
+    monkeypatch.setenv('TERM', 'xterm-256color')
+    colors.refresh_color_support()
+    yield
+    colors.refresh_color_support()
+
+
+class TestSupportsColor:
+    """Tests for supports_color() and its cache."""
+
+    def test_tty_supports_color(self, tty):
+        assert colors.supports_color()
+
+    def test_no_color_disables(self, tty, monkeypatch):
+        monkeypatch.setenv('NO_COLOR', '1')
+        colors.refresh_color_support()
+        assert not colors.supports_color()
+
+    def test_dumb_terminal_disables(self, tty, monkeypatch):
+        monkeypatch.setenv('TERM', 'dumb')
+        colors.refresh_color_support()
+        assert not colors.supports_color()
+
+    def test_result_is_cached_until_refreshed(self, tty, monkeypatch):
+        assert colors.supports_color()
+        monkeypatch.setenv('NO_COLOR', '1')
+        assert colors.supports_color()
+        colors.refresh_color_support()
+        assert not colors.supports_color()
+
+
+class TestColors:
+    """Tests for the Colors table."""
+
+    def test_enabled_colors_use_ansi_codes(self, tty):
+        c = colors._make_colors()
+        assert c.GREEN == '\033[32m'
+        assert c.RESET == '\033[0m'
+
+    def test_disabled_colors_are_empty(self, tty, monkeypatch):
+        monkeypatch.setenv('NO_COLOR', '1')
+        colors.refresh_color_support()
+        c = colors._make_colors()
+        assert c.GREEN == ''
+        assert c.RESET == ''
@@ -0,0 +1,226 @@
+"""Tests for config schema tracking and migrations."""
+
+import os
+
+import pytest
+
+from tally.merchant_utils import clear_engine_cache, get_all_rules, get_cached_engine, normalize_merchant
+from tally.migrations import (
+    SCHEMA_VERSION,
+    _reset_migration_cache,
+    check_merchant_migration,
+    get_schema_version,
+    migrate_csv_to_rules,
+    migrate_v0_to_v1,
+    run_migrations,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    _reset_migration_cache()
+    clear_engine_cache()
+    yield
+    _reset_migration_cache()
+    clear_engine_cache()
+
+
+class TestSchemaVersion:
+    """Tests for reading the .tally-schema marker."""
+
+    def test_missing_marker_is_legacy(self, tmp_path):
+        assert get_schema_version(str(tmp_path)) == 0
+
+    def test_reads_marker(self, tmp_path):
+        (tmp_path / '.tally-schema').write_text('1\n')
+        assert get_schema_version(str(tmp_path)) == 1
+
+    def test_empty_marker_is_legacy(self, tmp_path):
+        (tmp_path / '.tally-schema').write_bytes(b'')
+        assert get_schema_version(str(tmp_path)) == 0
+
+    def test_invalid_marker_is_legacy(self, tmp_path):
+        (tmp_path / '.tally-schema').write_text('not a number\n')
+        assert get_schema_version(str(tmp_path)) == 0
+
+
+class TestRunMigrations:
+    """Tests for run_migrations short-circuiting."""
+
+    def test_up_to_date_config_is_remembered(self, tmp_path):
+        config_dir = str(tmp_path)
+        (tmp_path / '.tally-schema').write_text(f'{SCHEMA_VERSION}\n')
+        assert run_migrations(config_dir) == config_dir
+
+        # Marker is not re-read once the directory is known to be current
+        os.remove(tmp_path / '.tally-schema')
+        assert run_migrations(config_dir) == config_dir
+        assert get_schema_version.cache_info().misses == 1
+
+
+class TestMigrateV0ToV1:
+    """Tests for moving the legacy ./config layout under ./tally."""
+
+    def test_moves_config_data_and_output(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'config').mkdir()
+        (tmp_path / 'config' / 'settings.yaml').write_text('year: 2025\n')
+        (tmp_path / 'data').mkdir()
+        (tmp_path / 'data' / 'bank.csv').write_text('date,amount\n')
+        (tmp_path / 'output').mkdir()
+        (tmp_path / 'notes').mkdir()
+
+        new_config = migrate_v0_to_v1(os.path.join(os.getcwd(), 'config'), skip_confirm=True)
+
+        assert new_config == os.path.join(os.getcwd(), 'tally', 'config')
+        assert (tmp_path / 'tally' / 'config' / 'settings.yaml').exists()
+        assert (tmp_path / 'tally' / 'data' / 'bank.csv').exists()
+        assert (tmp_path / 'tally' / 'output').is_dir()
+        assert (tmp_path / 'notes').is_dir()
+        assert not (tmp_path / 'data').exists()
+        assert get_schema_version(new_config) == SCHEMA_VERSION
+
+    def test_moves_differently_cased_dir_found_by_isdir(self, tmp_path, monkeypatch):
+        from tally import migrations
+
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'config').mkdir()
+        (tmp_path / 'Data').mkdir()
+        (tmp_path / 'Data' / 'bank.csv').write_text('date,amount\n')
+
+        # Simulate a case-insensitive filesystem resolving 'data' to 'Data'
+        real_isdir = os.path.isdir
+
+        def case_insensitive_isdir(path):
+            head, tail = os.path.split(path)
+            return real_isdir(os.path.join(head, 'Data')) if tail == 'data' else real_isdir(path)
+
+        real_move = migrations.shutil.move
+
+        def case_insensitive_move(src, dst):
+            head, tail = os.path.split(src)
+            return real_move(os.path.join(head, 'Data') if tail == 'data' else src, dst)
+
+        monkeypatch.setattr(migrations.os.path, 'isdir', case_insensitive_isdir)
+        monkeypatch.setattr(migrations.shutil, 'move', case_insensitive_move)
+
+        migrate_v0_to_v1(os.path.join(os.getcwd(), 'config'), skip_confirm=True)
+
+        assert (tmp_path / 'tally' / 'data' / 'bank.csv').exists()
+
+    def test_ignores_non_legacy_layout(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'settings').mkdir()
+        assert migrate_v0_to_v1(os.path.join(os.getcwd(), 'settings'), skip_confirm=True) is None
+
+
+class TestMigrateCsvToRules:
+    """Tests for converting merchant_categories.csv to merchants.rules."""
+
+    def _write_csv(self, config_dir):
+        csv_file = config_dir / 'merchant_categories.csv'
+        csv_file.write_text('Pattern,Merchant,Category,Subcategory\nNETFLIX,Netflix,Subscriptions,Streaming\n')
+        return str(csv_file)
+
+    def test_appends_merchants_file_to_settings(self, tmp_path):
+        csv_file = self._write_csv(tmp_path)
+        (tmp_path / 'settings.yaml').write_text('year: 2025\n')
+
+        success, rules = migrate_csv_to_rules(csv_file, str(tmp_path))
+        assert success
+        assert [rule[1] for rule in rules] == ['Netflix']
+
+        assert 'Netflix' in (tmp_path / 'merchants.rules').read_text()
+        assert (tmp_path / 'merchant_categories.csv.bak').exists()
+        settings = (tmp_path / 'settings.yaml').read_text()
+        assert settings.startswith('year: 2025\n')
+        assert settings.count('merchants_file: config/merchants.rules') == 1
+
+    def test_keeps_existing_merchants_file(self, tmp_path):
+        csv_file = self._write_csv(tmp_path)
+        (tmp_path / 'settings.yaml').write_text('merchants_file: config/custom.rules\n')
+
+        success, rules = migrate_csv_to_rules(csv_file, str(tmp_path))
+        assert success
+
+        assert (tmp_path / 'settings.yaml').read_text() == 'merchants_file: config/custom.rules\n'
+
+    def test_read_only_settings_with_merchants_file(self, tmp_path, monkeypatch):
+        import builtins
+        from tally import migrations
+
+        csv_file = self._write_csv(tmp_path)
+        settings_path = str(tmp_path / 'settings.yaml')
+        (tmp_path / 'settings.yaml').write_text('merchants_file: config/custom.rules\n')
+
+        def read_only_settings(path, mode='r', *args, **kwargs):
+            if path == settings_path and mode != 'rb':
+                raise PermissionError(path)
+            return builtins.open(path, mode, *args, **kwargs)
+
+        monkeypatch.setattr(migrations, 'open', read_only_settings, raising=False)
+        success, rules = migrate_csv_to_rules(csv_file, str(tmp_path))
+        assert success
+
+    def test_missing_settings_is_not_created(self, tmp_path):
+        csv_file = self._write_csv(tmp_path)
+
+        success, rules = migrate_csv_to_rules(csv_file, str(tmp_path))
+        assert success
+
+        assert not (tmp_path / 'settings.yaml').exists()
+
+    def test_failure_returns_no_rules(self, tmp_path):
+        csv_file = self._write_csv(tmp_path)
+        success, rules = migrate_csv_to_rules(csv_file, str(tmp_path / 'missing'))
+        assert not success
+        assert rules is None
+
+
+class TestCheckMerchantMigration:
+    """Tests for choosing how merchant rules are loaded."""
+
+    def test_no_rules_file(self, tmp_path, capsys):
+        rules = check_merchant_migration({}, str(tmp_path))
+        assert isinstance(rules, list)
+        assert 'No merchant rules found' in capsys.readouterr().out
+
+    def test_new_format_reports_count(self, tmp_path, capsys):
+        rules_file = tmp_path / 'merchants.rules'
+        rules_file.write_text('[Netflix]\nmatch: contains("NETFLIX")\ncategory: Subscriptions\n')
+        config = {'_merchants_file': str(rules_file), '_merchants_format': 'new'}
+
+        rules = check_merchant_migration(config, str(tmp_path))
+
+        assert len(rules) == 1
+        assert 'Loaded 1 categorization rules' in capsys.readouterr().out
+
+    def test_csv_migrate_flag_converts(self, tmp_path, capsys):
+        csv_file = tmp_path / 'merchant_categories.csv'
+        csv_file.write_text('Pattern,Merchant,Category,Subcategory\nNETFLIX,Netflix,Subscriptions,Streaming\n')
+        config = {'_merchants_file': str(csv_file), '_merchants_format': 'csv'}
+
+        rules = check_merchant_migration(config, str(tmp_path), migrate=True)
+
+        assert len(rules) == 1
+        assert (tmp_path / 'merchants.rules').exists()
+        assert 'Migration complete!' in capsys.readouterr().out
+
+    def test_csv_migration_honors_most_specific(self, tmp_path):
+        csv_file = tmp_path / 'merchant_categories.csv'
+        csv_file.write_text(
+            'Pattern,Merchant,Category,Subcategory\n'
+            'UBER,Uber,Transport,Rideshare\n'
+            'UBER EATS,Uber Eats,Food,Delivery\n'
+        )
+        config = {
+            '_merchants_file': str(csv_file),
+            '_merchants_format': 'csv',
+            'rule_mode': 'most_specific',
+        }
+
+        rules = check_merchant_migration(config, str(tmp_path), quiet=True, migrate=True)
+
+        assert get_cached_engine() is not None
+        assert rules == get_all_rules(str(tmp_path / 'merchants.rules'), match_mode='most_specific')
+        assert normalize_merchant('UBER EATS 123', rules)[:3] == ('Uber Eats', 'Food', 'Delivery')
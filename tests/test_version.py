@@ -0,0 +1,133 @@
+"""Tests for version parsing and comparison."""
+
+import pytest
+
+from tally._version import _version_greater, parse_version
+
+
+class TestVersionGreater:
+    """Tests for semantic version comparison."""
+
+    def test_newer_patch(self):
+        assert _version_greater('0.1.101', '0.1.100')
+        assert not _version_greater('0.1.100', '0.1.101')
+
+    def test_release_beats_prerelease(self):
+        assert _version_greater('0.1.100', '0.1.100-dev')
+        assert not _version_greater('0.1.100-dev', '0.1.100')
+
+    def test_equal_versions_skip_parsing(self):
+        parse_version.cache_clear()
+        assert not _version_greater('0.1.100', '0.1.100')
+        assert parse_version.cache_info().currsize == 0
+
+    def test_invalid_version_is_not_greater(self):
+        assert not _version_greater('garbage', '0.1.0')
+        assert not _version_greater('0.1.0', 'garbage')
+
+    def test_parse_version_is_cached(self):
+        parse_version.cache_clear()
+        parse_version('1.2.3')
+        parse_version('1.2.3')
+        info = parse_version.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+
+@pytest.fixture
+def update_cache(tmp_path, monkeypatch):
+    """Point the update cache at tmp_path and pin the running version."""
+    from tally import _version
+
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path))
+    monkeypatch.setattr(_version, 'VERSION', '0.1.100')
+    return _version
+
+
+class TestUpdateCheckCache:
+    """Tests for the on-disk update check cache."""
+
+    def test_fresh_cache_skips_network(self, update_cache, monkeypatch):
+        update_cache._write_update_cache({
+            'latest_version': '0.1.101',
+            'current_version': '0.1.100',
+            'update_available': True,
+            'is_prerelease': False,
+            'release_url': 'https://example.com',
+        })
+
+        def fail(*args, **kwargs):
+            raise AssertionError('network should not be used')
+
+        monkeypatch.setattr('urllib.request.urlopen', fail)
+        monkeypatch.setattr(update_cache, '_github_get', fail)
+        result = update_cache.check_for_updates()
+        assert result['latest_version'] == '0.1.101'
+        assert 'timestamp' not in result
+
+    def test_stale_cache_is_ignored(self, update_cache):
+        update_cache._write_update_cache({'current_version': '0.1.100'})
+        assert update_cache._read_update_cache(ttl=-1) is None
+
+    def test_future_mtime_is_stale(self, update_cache):
+        import os
+        import time
+
+        update_cache._write_update_cache({'current_version': '0.1.100'})
+        future = time.time() + 7 * 24 * 60 * 60
+        os.utime(update_cache._get_update_cache_path(), (future, future))
+        assert update_cache._read_update_cache() is None
+
+    def test_cache_from_other_version_is_ignored(self, update_cache):
+        update_cache._write_update_cache({'current_version': '0.1.99'})
+        assert update_cache._read_update_cache() is None
+
+
+class _FakeResponse:
+    def __init__(self, status):
+        self.status = status
+
+    def read(self):
+        return b'{"tag_name": "v0.1.101"}'
+
+
+class _FakeConnection:
+    instances = []
+
+    def __init__(self, host, timeout=None):
+        self.timeout = timeout
+        self.sock = None
+        self.status = 200
+        _FakeConnection.instances.append(self)
+
+    def request(self, method, path, headers=None):
+        pass
+
+    def getresponse(self):
+        return _FakeResponse(self.status)
+
+    def close(self):
+        pass
+
+
+class TestGithubGet:
+    """Tests for the (not yet wired) shared GitHub API connection."""
+
+    def test_reuses_connection_until_error(self, monkeypatch):
+        import http.client
+        from tally import _version
+
+        _FakeConnection.instances = []
+        monkeypatch.setattr('http.client.HTTPSConnection', _FakeConnection)
+        monkeypatch.setattr('urllib.request.getproxies', lambda: {})
+        monkeypatch.setattr(_version, '_conn', None)
+
+        assert _version._github_get('/a', 2.0) == {'tag_name': 'v0.1.101'}
+        _version._github_get('/b', 2.0)
+        assert len(_FakeConnection.instances) == 1
+
+        _FakeConnection.instances[0].status = 404
+        with pytest.raises(http.client.HTTPException):
+            _version._github_get('/missing', 2.0)
+        assert _version._conn is None